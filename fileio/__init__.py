@@ -1,12 +1,19 @@
 from .utils import (is_str, is_filepath, has_method,
                     mkdir_or_exist, is_list_of)
-from .handlers import JsonHandler
 from .file_client import FileClient
-from .io import dump, load
+from .io import dump, load, register_handler
+
+
+def __getattr__(name):
+    # the handlers are imported lazily by ``fileio.handlers``
+    if name in ('JsonHandler', 'JsonlHandler'):
+        from . import handlers
+        return getattr(handlers, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 __all__ = [
     'is_str', 'is_filepath', 'has_method', 'mkdir_or_exist',
-    'JsonHandler', 'FileClient', 'is_list_of', 'dump',
-    'load'
+    'JsonHandler', 'JsonlHandler', 'FileClient', 'is_list_of', 'dump',
+    'load', 'register_handler'
 ]
\ No newline at end of file
@@ -1,19 +1,47 @@
 import os
 import os.path as osp
+import queue
+import shutil
+import stat
 import tempfile
 import inspect
+import locale
+import mmap
+import threading
+import time
+import uuid
+import warnings
+from collections import OrderedDict, deque
 from pathlib import Path
+from urllib.error import HTTPError
 from urllib.request import urlopen
 from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABCMeta, abstractmethod
-from typing import Any, Generator, Iterator, Optional, Tuple, Union
+from typing import (Any, BinaryIO, Callable, Generator, Iterator, List,
+                    Optional, Sequence, TextIO, Tuple, Union)
 from .utils import mkdir_or_exist, is_filepath
 
 
+def _thread_map(func: Callable, items: Sequence,
+                max_workers: Optional[int] = None,
+                default_workers: int = 64) -> List:
+    """Apply ``func`` to ``items`` in a thread pool, keeping the order."""
+    if max_workers is None:
+        max_workers = default_workers
+    max_workers = min(max_workers, len(items))
+    if max_workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
+
+
 class BaseStorgeBackend(metaclass=ABCMeta):
     """
     get(): reads the file as a byte stream.
     get_text(): reads the file as texts.
+    get_many(): reads several files as byte streams.
     """
     _allow_symlink = False
 
@@ -34,6 +62,10 @@ class BaseStorgeBackend(metaclass=ABCMeta):
     def get_text(self, filepath):
         pass
 
+    def get_many(self, filepaths, max_workers=None):
+        """Read several files, one after another by default."""
+        return [self.get(filepath) for filepath in filepaths]
+
 
 class MemcachedBackend(BaseStorgeBackend):
     """Memcached storage backend. need large memory.
@@ -72,6 +104,14 @@ class MemcachedBackend(BaseStorgeBackend):
         raise NotImplementedError
 
 
+def _total_memory() -> Optional[int]:
+    """Return the size of physical memory in bytes, or None if unknown."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
 class LmdbBackend(BaseStorgeBackend):
     """Lmdb storage backend.
 
@@ -84,16 +124,34 @@ class LmdbBackend(BaseStorgeBackend):
         readahead (bool, optional): Lmdb environment parameter. If False,
             disable the OS filesystem readahead mechanism, which may improve
             random read performance when a database is larger than RAM.
-            Default: False.
+            In that case lmdb also advises the kernel with ``MADV_RANDOM``
+            for the memory map. A warning is raised if readahead is enabled
+            on a database larger than RAM. Default: False.
+        buffers (bool, optional): If True, :meth:`get` returns a
+            ``memoryview`` into the memory map instead of a copy of the
+            value as ``bytes``. Default: False.
+
+    Note:
+        Each thread reuses one read transaction across :meth:`get` calls
+        instead of beginning a new one per call. The transaction is renewed
+        every ``txn_renew_interval`` reads, and by the first read after it
+        is ``txn_max_age`` seconds old, to pick up changes made by writers.
+        With ``buffers=True`` a returned ``memoryview`` is only valid until
+        the transaction is renewed, use ``.tobytes()`` to keep the value
+        longer.
 
     Attributes:
         db_path (str): Lmdb database path.
     """
+    txn_renew_interval = 1024
+    txn_max_age = 0.1
+
     def __init__(self,
                  db_path,
                  readonly=True,
                  lock=False,
                  readahead=False,
+                 buffers=False,
                  **kwargs):
         try:
             import lmdb
@@ -104,8 +162,13 @@ class LmdbBackend(BaseStorgeBackend):
         self.readonly = readonly
         self.lock = lock
         self.readahead = readahead
+        self.buffers = buffers
         self.kwargs = kwargs
+        # read transactions are cached per thread, keep a few spare ones
+        # around so that short-lived threads can recycle them
+        self.kwargs.setdefault('max_spare_txns', 16)
         self._client = None
+        self._local = threading.local()
 
     def get(self, filepath):
         """Get values according to the filepath.
@@ -116,59 +179,286 @@ class LmdbBackend(BaseStorgeBackend):
         if self._client is None:
             self._client = self._get_client()
 
-        with self._client.begin(write=False) as txn:
-            value_buf = txn.get(str(filepath).encode('utf-8'))
-        return value_buf
+        return self._get_txn().get(str(filepath).encode('utf-8'))
 
-    def get_text(self, filepath):
-        raise NotImplementedError
+    def get_many(self, filepaths, max_workers=None):
+        """Get values of several keys with a pool of threads.
 
+        Lmdb reads scale with the number of threads since each thread uses
+        its own read transaction. The values are always returned as
+        ``bytes`` because the transactions of the worker threads end with
+        the threads.
+        """
+        if self._client is None:
+            self._client = self._get_client()
+
+        def _get(filepath):
+            value_buf = self.get(filepath)
+            if self.buffers and value_buf is not None:
+                value_buf = value_buf.tobytes()
+            return value_buf
+
+        return _thread_map(_get, list(filepaths), max_workers)
+
+    def get_text(self, filepath, encoding='utf-8'):
+        value_buf = self.get(filepath)
+        if value_buf is None:
+            return None
+        # decoding works on the memoryview directly when ``buffers=True``
+        return str(value_buf, encoding)
+
+    def _get_txn(self):
+        """Return the read transaction of the current thread."""
+        local = self._local
+        txn = getattr(local, 'txn', None)
+        if txn is not None and (
+                local.num_reads >= self.txn_renew_interval
+                or time.monotonic() - local.begin_time >= self.txn_max_age):
+            # start a new transaction to see the changes of writers, the
+            # aborted one is recycled thanks to ``max_spare_txns``
+            txn.abort()
+            txn = None
+        if txn is None:
+            txn = local.txn = self._client.begin(write=False,
+                                                 buffers=self.buffers)
+            local.num_reads = 0
+            local.begin_time = time.monotonic()
+        local.num_reads += 1
+        return txn
 
     def _get_client(self):
         import lmdb
 
-        return lmdb.open(
+        env = lmdb.open(
             self.dp_path,
             readonly=self.readonly,
             lock=self.lock,
             readahead=self.readahead,
             **self.kwargs
         )
+        if self.readahead:
+            total_memory = _total_memory()
+            # ``map_size`` is only the reserved address space, the data
+            # ends at the last used page
+            db_size = (env.info()['last_pgno'] + 1) * env.stat()['psize']
+            if total_memory is not None and db_size > total_memory:
+                warnings.warn(
+                    f'The lmdb database {self.dp_path} ({db_size} bytes) is '
+                    'larger than RAM, set `readahead=False` to improve random '
+                    'read performance.')
+        return env
 
     def __del__(self):
-        self._client.close()
+        if self._client is not None:
+            self._client.close()
+
+
+_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0) | getattr(
+    os, 'O_CLOEXEC', 0)
+_READ_CHUNK = 1 << 16
+# files of at least this size are announced to the kernel with
+# ``posix_fadvise`` so that it reads ahead aggressively
+_FADVISE_THRESHOLD = 1 << 20
+# texts of at least this size are decoded from a memory map instead of
+# being read into a temporary bytes object first
+_MMAP_THRESHOLD = 1 << 26
+# buffer size used by the disk backend when writing text or streaming data
+_WRITE_BUFFER = 1 << 17
+
+
+def _read_file(filepath: Union[str, Path],
+               encoding: Optional[str] = None) -> Union[bytes, str]:
+    """Read a whole file with a single ``read`` on a raw file descriptor.
+
+    This skips the ``BufferedReader`` that ``open(filepath, 'rb')`` creates,
+    whose buffer is useless when the whole file is read at once.
+
+    Args:
+        filepath (str | Path): Path of the file.
+        encoding (str, optional): If given, decode the content and return
+            a str. Default: None.
+    """
+    fd = os.open(filepath, _READ_FLAGS)
+    try:
+        size = os.fstat(fd).st_size
+        if size >= _FADVISE_THRESHOLD and hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+        if encoding is not None and size >= _MMAP_THRESHOLD:
+            with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mm:
+                return str(mm, encoding)
+
+        value_buf = os.read(fd, size) if size else b''
+        if not size or len(value_buf) < size:
+            # short read (very large files) or a size that is not reported
+            # by the file system (e.g. procfs), read until EOF
+            chunks = [value_buf]
+            while True:
+                chunk = os.read(fd, _READ_CHUNK)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            value_buf = b''.join(chunks)
+    finally:
+        os.close(fd)
+    if encoding is not None:
+        return value_buf.decode(encoding)
+    return value_buf
+
+
+@lru_cache(maxsize=1024)
+def _ensure_dir(dir_name: str) -> None:
+    """Create ``dir_name`` once, repeated calls for it are free."""
+    mkdir_or_exist(dir_name)
+
+
+def _open_for_write(filepath: Union[str, Path], mode: str, **kwargs):
+    """Open ``filepath`` for writing, creating its directory if needed."""
+    dir_name = osp.dirname(filepath)
+    _ensure_dir(dir_name)
+    try:
+        return open(filepath, mode, **kwargs)
+    except FileNotFoundError:
+        # the directory was removed after it had been created
+        mkdir_or_exist(dir_name)
+        return open(filepath, mode, **kwargs)
+
+
+@contextmanager
+def _atomic_write(filepath: Union[str, Path], mode: str, **kwargs):
+    """Yield a file object whose content replaces ``filepath`` on success.
+
+    The data is written to a temporary file next to ``filepath``, which is
+    renamed over ``filepath`` once the ``with`` block exits without error.
+    If writing fails part-way through, an existing ``filepath`` is left
+    untouched and the temporary file is removed.
+
+    Symbolic links are resolved, so the links are kept. Targets that can
+    not be replaced without losing something (not a regular file, more than
+    one hard link, an owner that can not be kept or a directory that is not
+    writable) are written in place like ``open(filepath, mode)`` does.
+    """
+    filepath = osp.realpath(filepath)
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
+        st = None
+    f = None
+    if st is None or (stat.S_ISREG(st.st_mode) and st.st_nlink == 1):
+        # a short hidden name, it must fit when ``filepath`` is as long as
+        # the file system allows and stays out of ``list_dir_or_file``.
+        # ``tempfile.mkstemp`` is not used, it ignores the umask and would
+        # create new files with mode 0600
+        tmp_path = osp.join(osp.dirname(filepath),
+                            f'.{uuid.uuid4().hex[:12]}.tmp')
+        try:
+            f = _open_for_write(tmp_path, mode.replace('w', 'x'), **kwargs)
+        except PermissionError:
+            pass
+    if f is not None and st is not None:
+        try:
+            # keep the owner and the permissions of the file that is
+            # replaced
+            tmp_st = os.fstat(f.fileno())
+            if (tmp_st.st_uid, tmp_st.st_gid) != (st.st_uid, st.st_gid):
+                os.chown(tmp_path, st.st_uid, st.st_gid)
+            os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+        except OSError:
+            f.close()
+            os.remove(tmp_path)
+            f = None
+    if f is None:
+        with _open_for_write(filepath, mode, **kwargs) as f:
+            yield f
+        return
+
+    try:
+        with f:
+            yield f
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 class HardDiskBackend(BaseStorgeBackend):
     _allow_symlink = True
 
     def get(self, filepath: Union[str, Path]) -> bytes:
-        with open(filepath, 'rb') as f:
-            value_buf = f.read()
-        return value_buf
+        return _read_file(filepath)
 
     def get_text(self,
                  filepath: Union[str, Path],
-                 encoding: str = 'utf-8') -> str:
-        with open(filepath, encoding=encoding) as f:
-            value_buf = f.read()
-        return value_buf
+                 encoding: Optional[str] = 'utf-8') -> str:
+        """Read the file as texts.
+
+        Note:
+            The bytes are decoded as is, so newlines are not translated as
+            they would be by ``open`` in text mode. An ``encoding`` of None
+            means the locale encoding, like for ``open``.
+        """
+        if encoding is None:
+            # ``_read_file`` returns bytes without an encoding
+            encoding = locale.getpreferredencoding(False)
+        return _read_file(filepath, encoding)
+
+    def get_many(self,
+                 filepaths: Sequence[Union[str, Path]],
+                 max_workers: Optional[int] = None) -> List[bytes]:
+        """Read several files concurrently with a pool of threads.
+
+        Reading releases the GIL, so the requests are issued in parallel and
+        the device can serve them at a higher queue depth.
+        """
+        return _thread_map(_read_file, list(filepaths), max_workers)
 
     def put(self,
             obj: bytes,
             filepath: Union[str, Path]) -> None:
-        mkdir_or_exist(osp.dirname(filepath))
-        with open(filepath, 'wb') as f:
-            f.write(obj)
+        # ``obj`` is already contiguous, write it without a BufferedWriter
+        with _open_for_write(filepath, 'wb', buffering=0) as f:
+            view = memoryview(obj)
+            while view:
+                view = view[f.write(view):]
 
     def put_text(self,
                  obj: str,
                  filepath: Union[str, Path],
                  encoding: str = 'utf-8') -> None:
-        mkdir_or_exist(osp.dirname(filepath))
-        with open(filepath, 'w', encoding=encoding) as f:
+        with _open_for_write(filepath, 'w', encoding=encoding,
+                             buffering=_WRITE_BUFFER) as f:
             f.write(obj)
 
+    @contextmanager
+    def put_stream(self,
+                   filepath: Union[str, Path]) -> Generator[BinaryIO, None, None]:
+        """Open ``filepath`` with 'wb' mode and yield the file object.
+
+        Unlike :meth:`put`, the caller writes into the file directly, so the
+        data does not need to be buffered in memory beforehand. The data is
+        written to a temporary file that replaces ``filepath`` only when the
+        ``with`` block succeeds, so an error while writing leaves an
+        existing ``filepath`` intact.
+        """
+        with _atomic_write(filepath, 'wb', buffering=_WRITE_BUFFER) as f:
+            yield f
+
+    @contextmanager
+    def put_text_stream(self,
+                        filepath: Union[str, Path],
+                        encoding: str = 'utf-8') -> Generator[TextIO, None, None]:
+        """Open ``filepath`` with 'w' mode and yield the file object.
+
+        Like :meth:`put_stream`, ``filepath`` is only replaced when the
+        ``with`` block succeeds.
+        """
+        with _atomic_write(filepath, 'w', encoding=encoding,
+                           buffering=_WRITE_BUFFER) as f:
+            yield f
+
     def remove(self, filepath: Union[str, Path]) -> None:
         os.remove(filepath)
 
@@ -197,11 +487,18 @@ class HardDiskBackend(BaseStorgeBackend):
                          list_dir: bool = True,
                          list_file: bool = True,
                          suffix: Optional[Union[str, Tuple[str]]] = None,
-                         recursive: bool = False) -> Iterator[str]:
+                         recursive: bool = False,
+                         return_entries: bool = False,
+                         workers: int = 1,
+                         chunk_size: int = 0) -> Iterator:
         """scan a directory to find the interested directories or
         files in arbitrary order.
         Note:
-            return the relative to 'dir_path'
+            return the relative to 'dir_path'.
+            Hidden files and directories (names starting with '.') are
+            skipped, hidden directories are not recursed into. Symbolic
+            links are not followed, links to files or directories are
+            neither listed nor recursed into.
         Args:
             dir_path (str | Path): Path of the directory.
             list_dir (bool): List the directories. Default: True.
@@ -210,8 +507,30 @@ class HardDiskBackend(BaseStorgeBackend):
                 that we are interested in. Default: None.
             recursive (bool): If set to True, recursively scan the
                 directory. Default: False.
+            return_entries (bool): If set to True, yield the
+                :class:`os.DirEntry` objects instead of relative paths. They
+                cache ``name``, ``path`` and ``stat(follow_symlinks=False)``,
+                and the relative path can be computed only for the entries
+                that are kept, e.g. with ``osp.relpath(entry.path,
+                dir_path)``. Default: False.
+            workers (int): Number of threads that scan directories
+                concurrently when ``recursive`` is True. Directory listing
+                is I/O bound, so 4-8 workers help on SSDs while spinning
+                disks are best left at 1. With more than one worker the
+                order of the results is not deterministic. Default: 1.
+            chunk_size (int): If greater than 0, yield lists of
+                ``chunk_size`` results (the last one may be shorter) instead
+                of single results. The results of each directory are
+                collected into a list while it is scanned, so the generator
+                is only resumed once per chunk instead of once per result,
+                at the cost of holding the results of a whole directory in
+                memory. Use ``itertools.chain.from_iterable`` to flatten
+                them. Default: 0, results are yielded one by one as soon as
+                they are found.
         Yields:
-            Iterable[str]: A relative path to ``dir_path``.
+            Iterable[str | os.DirEntry]: A relative path to ``dir_path``, or
+            the directory entry if ``return_entries`` is True. Lists of them
+            if ``chunk_size`` is greater than 0.
         """
         if list_dir and suffix is not None:
             raise TypeError('`suffix` should be None when `list_dir` is True')
@@ -219,38 +538,272 @@ class HardDiskBackend(BaseStorgeBackend):
         if (suffix is not None) and not isinstance(suffix, (str, tuple)):
             raise TypeError('`suffix` must be a string or tuple of strings')
 
-        root = dir_path
-
-        def _list_dir_or_file(dir_path, list_dir, list_file,
-                              suffix, recursive):
-            for entry in os.scandir(dir_path):
-                if not entry.name.startswith('.') and entry.is_file():
-                    rel_path = osp.relpath(entry.path, root)
-                    if (suffix is None
-                        or rel_path.endswith(suffix)) and list_file:
-                        yield rel_path
-                    elif osp.isdir(entry.path):
-                        if list_dir:
-                            rel_dir = osp.relpath(entry.path, root)
-                            yield rel_dir
+        if isinstance(suffix, str):
+            suffix = (suffix,)
+        # with many suffixes, avoid trying every suffix in turn. Plain
+        # extensions such as '.jpg' are looked up in a set with the
+        # extension of each file, other suffixes are grouped by length so
+        # that one set lookup is done per distinct length
+        ext_set = None
+        suffix_buckets = None
+        if suffix is not None and '' in suffix:
+            # every name ends with '', which ``name[-0:]`` in a bucket of
+            # length 0 would not see
+            suffix = None
+        if suffix is not None and len(suffix) > 4:
+            if all(s.rfind('.') == 0 for s in suffix):
+                ext_set = frozenset(suffix)
+            else:
+                buckets: dict = {}
+                for s in suffix:
+                    buckets.setdefault(len(s), set()).add(s)
+                suffix_buckets = tuple(
+                    (length, frozenset(group))
+                    for length, group in buckets.items())
+
+        def _scan_dir(scan_dir, rel_dir, add_subdir, add_result=None):
+            # yield the interested entries of one directory. If
+            # ``add_result`` (a bound ``list.append``) is given, the entries
+            # are passed to it instead and nothing is yielded, so the
+            # generator is resumed once per directory instead of once per
+            # entry. Each directory comes with its path relative to
+            # ``dir_path``, so relative paths of entries are built by one
+            # concatenation instead of ``osp.relpath``. Subdirectories to
+            # visit are passed to ``add_subdir``
+            prefix = rel_dir + os.sep if rel_dir else ''
+            with os.scandir(scan_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    # hidden files and directories are skipped before
+                    # their type is looked at
+                    if name[0] == '.':
+                        continue
+                    # DirEntry caches the file type returned by the
+                    # directory listing, no extra stat call is needed
+                    is_file = entry.is_file(follow_symlinks=False)
+                    is_dir = not is_file and entry.is_dir(
+                        follow_symlinks=False)
+                    if is_file:
+                        if not list_file:
+                            continue
+                        # match the name so that the relative path is
+                        # only built for the files that are yielded
+                        if suffix is None:
+                            matched = True
+                        elif ext_set is not None:
+                            matched = name[name.rfind('.'):] in ext_set
+                        elif suffix_buckets is not None:
+                            matched = any(
+                                name[-length:] in group
+                                for length, group in suffix_buckets)
+                        else:
+                            matched = name.endswith(suffix)
+                        if not matched:
+                            continue
+                        result = entry if return_entries else prefix + name
+                    elif is_dir:
+                        rel_path = prefix + name
                         if recursive:
-                            yield from _list_dir_or_file(entry.path, list_dir,
-                                                         list_file, suffix,
-                                                         recursive)
-
-        return _list_dir_or_file(dir_path, list_dir, list_file,
-                                 suffix, recursive)
+                            add_subdir((entry.path, rel_path))
+                        if not list_dir:
+                            continue
+                        result = entry if return_entries else rel_path
+                    else:
+                        continue
+                    if add_result is None:
+                        yield result
+                    else:
+                        add_result(result)
+
+        def _collect(scan_dir, rel_dir, add_subdir, add_result):
+            # run ``_scan_dir`` to the end, it yields nothing when
+            # ``add_result`` is given
+            next(_scan_dir(scan_dir, rel_dir, add_subdir, add_result), None)
+
+        def _split_chunks(buf):
+            # yield the full chunks of ``buf`` and return the results left
+            # over for the next chunk
+            start = 0
+            while len(buf) - start >= chunk_size:
+                yield buf[start:start + chunk_size]
+                start += chunk_size
+            return buf[start:]
+
+        def _list_dir_or_file():
+            # walk iteratively, directories that remain to be scanned are
+            # kept in a stack instead of nested generators
+            stack = deque([(dir_path, '')])
+            while stack:
+                yield from _scan_dir(*stack.pop(), stack.append)
+
+        def _list_dir_or_file_chunked():
+            # like ``_list_dir_or_file``, but the results are collected into
+            # a list while each directory is scanned
+            stack = deque([(dir_path, '')])
+            buf: list = []
+            while stack:
+                _collect(*stack.pop(), stack.append, buf.append)
+                buf = yield from _split_chunks(buf)
+            if buf:
+                yield buf
+
+        def _list_dir_or_file_parallel():
+            # every directory is scanned by a worker thread, the listing
+            # releases the GIL so that several directories are read at once.
+            # Subdirectories found by a worker are submitted from this
+            # thread, which also yields the results
+            results: queue.Queue = queue.Queue()
+
+            def _worker(scan_dir, rel_dir):
+                items: list = []
+                subdirs: list = []
+                try:
+                    _collect(scan_dir, rel_dir, subdirs.append, items.append)
+                except BaseException as e:
+                    results.put((e, None))
+                else:
+                    results.put((items, subdirs))
+
+            executor = ThreadPoolExecutor(max_workers=workers)
+            buf: list = []
+            try:
+                executor.submit(_worker, dir_path, '')
+                num_pending = 1
+                while num_pending:
+                    items, subdirs = results.get()
+                    num_pending -= 1
+                    if subdirs is None:
+                        raise items
+                    for subdir in subdirs:
+                        executor.submit(_worker, *subdir)
+                    num_pending += len(subdirs)
+                    if chunk_size > 0:
+                        buf.extend(items)
+                        buf = yield from _split_chunks(buf)
+                    else:
+                        yield from items
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            if buf:
+                yield buf
+
+        if workers > 1 and recursive:
+            return _list_dir_or_file_parallel()
+        if chunk_size > 0:
+            return _list_dir_or_file_chunked()
+        return _list_dir_or_file()
+
+
+_DOWNLOAD_CHUNK = 1 << 20
 
 
 class HTTPBackend(BaseStorgeBackend):
+    """HTTP and HTTPS storage backend.
+
+    If ``urllib3`` is installed, requests go through a pool manager that
+    keeps connections alive and retries failed requests, so consecutive
+    requests to the same host skip the TCP and TLS handshakes. Otherwise
+    every request is made with :func:`urllib.request.urlopen`.
+
+    :meth:`prefetch` starts downloading a url in the background, a later
+    :meth:`get` of the same url then returns the prefetched data. At most
+    ``max_prefetch`` urls are kept, the oldest ones are dropped first and
+    their downloads are cancelled if they have not started yet.
+    """
+    max_prefetch = 64
+
+    def __init__(self):
+        self._prefetched = OrderedDict()
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_executor = None
+        try:
+            import urllib3
+        except ImportError:
+            self._pool = None
+        else:
+            self._pool = urllib3.PoolManager(
+                num_pools=10,
+                maxsize=16,
+                block=False,
+                retries=urllib3.Retry(total=3, backoff_factor=0.1))
+
+    def _request(self, filepath, preload_content=True):
+        """Send a GET request to ``filepath`` with the pool manager."""
+        response = self._pool.request('GET', filepath,
+                                      preload_content=preload_content)
+        if response.status >= 400:
+            response.release_conn()
+            # raise the same error as ``urlopen``
+            raise HTTPError(filepath, response.status, response.reason,
+                            response.headers, None)
+        return response
+
+    @contextmanager
+    def _open(self, filepath):
+        """Yield a response of ``filepath`` whose body is read lazily."""
+        if self._pool is None:
+            with urlopen(filepath) as response:
+                yield response
+            return
+        response = self._request(filepath, preload_content=False)
+        try:
+            yield response
+        finally:
+            response.release_conn()
+
+    def _fetch(self, filepath):
+        if self._pool is None:
+            with urlopen(filepath) as response:
+                return response.read()
+        return self._request(filepath).data
+
     def get(self, filepath):
-        value_buf = urlopen(filepath).read()
-        return value_buf
+        with self._prefetch_lock:
+            future = self._prefetched.pop(filepath, None)
+        if future is not None:
+            return future.result()
+        return self._fetch(filepath)
+
+    def get_many(self, filepaths, max_workers=None):
+        """Download several urls concurrently with a pool of threads."""
+        return _thread_map(self.get, list(filepaths), max_workers,
+                           default_workers=16)
+
+    def prefetch(self, filepath):
+        """Start downloading ``filepath`` in the background.
+
+        Examples:
+            >>> client = HTTPBackend()
+            >>> for url, next_url in zip(urls, urls[1:] + [None]):
+            ...     if next_url is not None:
+            ...         client.prefetch(next_url)
+            ...     data = client.get(url)  # overlaps with the next download
+        """
+        with self._prefetch_lock:
+            if filepath in self._prefetched:
+                return
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(max_workers=4)
+            self._prefetched[filepath] = self._prefetch_executor.submit(
+                self._fetch, filepath)
+            while len(self._prefetched) > self.max_prefetch:
+                # downloads that have not started yet are skipped
+                self._prefetched.popitem(last=False)[1].cancel()
 
     def get_text(self, filepath, encoding='utf-8'):
-        value_buf = urlopen(filepath).read()
+        value_buf = self.get(filepath)
         return value_buf.decode(encoding)
 
+    def download(self, filepath: str, dst: Union[str, Path]) -> None:
+        """Download ``filepath`` to the local path ``dst``.
+
+        The response is written in chunks, the whole body is never held in
+        memory. ``dst`` is only replaced once the whole body has been
+        received, a failed download leaves an existing ``dst`` intact.
+        """
+        with self._open(filepath) as response, _atomic_write(dst, 'wb') as f:
+            shutil.copyfileobj(response, f, length=_DOWNLOAD_CHUNK)
+
     @contextmanager
     def get_local_path(self, filepath: str) -> Generator[Union[str, Path], None, None]:
         """
@@ -270,10 +823,12 @@ class HTTPBackend(BaseStorgeBackend):
             >>> with client.get_local_path('http://path/of/your/file') as path:
             ...     # do something here
         """
+        f = tempfile.NamedTemporaryFile(delete=False)
         try:
-            f = tempfile.NamedTemporaryFile(delete=False)
-            f.write(self.get(filepath))
-            f.close()
+            # copy the response in chunks instead of holding the whole
+            # body in memory
+            with f, self._open(filepath) as response:
+                shutil.copyfileobj(response, f, length=_DOWNLOAD_CHUNK)
             yield f.name
         finally:
             os.remove(f.name)
@@ -290,7 +845,9 @@ class FileClient:
         Note that It can also register other backend accessor with a given name,
         prefixes, and backend class. In addition, We use the singleton pattern to
         avoid repeated object creation. If the arguments are the same, the same
-        object will be returned.
+        object will be returned. So there is no need to keep a client around,
+        e.g. ``FileClient(prefix='https')`` always returns the same backend
+        and its pooled HTTP connections are reused across calls.
 
         Args:
             backend (str, optional): The storage backend type. Options are "disk",
@@ -331,6 +888,11 @@ class FileClient:
 
     def __new__(cls, backend=None, prefix=None, **kwargs):
         if backend is None and prefix is None:
+            if not kwargs:
+                # fast path for the default disk client
+                _instance = cls._instances.get(('disk', None, ()))
+                if _instance is not None:
+                    return _instance
             backend = 'disk'
         if backend is not None and backend not in cls._backends:
             raise ValueError(
@@ -341,11 +903,16 @@ class FileClient:
                 f'prefix {prefix} is not supported.'
             )
 
-        # concatenate the arguments to a unique key for determining whether
+        # build a unique key from the arguments for determining whether
         # objects with the same arguments were created
-        arg_key = f'{backend}:{prefix}'
-        for key, value in kwargs.items():
-            arg_key += f':{key}:{value}'
+        arg_key = (backend, prefix, tuple(sorted(kwargs.items())))
+        try:
+            hash(arg_key)
+        except TypeError:
+            # unhashable argument values are keyed by their string form
+            arg_key = (backend, prefix,
+                       tuple((key, str(value))
+                             for key, value in sorted(kwargs.items())))
 
         if arg_key in cls._instances:
             _instance = cls._instances[arg_key]
@@ -382,6 +949,11 @@ class FileClient:
         """
         assert is_filepath(uri)
         uri = str(uri)
+        # absolute local paths (posix or windows drive) have no prefix,
+        # skip scanning the whole string for '://'
+        if uri[:1] == '/' or uri[1:3] == ':\\' or (uri[1:3] == ':/'
+                                                 and uri[3:4] != '/'):
+            return None
         if '://' not in uri:
             return None
         else:
@@ -401,6 +973,9 @@ class FileClient:
         assert  file_client_args is not None or uri is not None
         if file_client_args is None:
             file_prefix = cls.parse_uri_prefix(uri)
+            if file_prefix is None:
+                # local paths hit the cached default disk client
+                return cls()
             return  cls(prefix=file_prefix)
         else:
             return cls(**file_client_args)
@@ -483,6 +1058,25 @@ class FileClient:
         """Read data from a given ``filepath`` with 'r' mode."""
         return self.client.get_text(filepath, encoding)
 
+    def get_many(
+            self,
+            filepaths: Sequence[Union[str, Path]],
+            max_workers: Optional[int] = None
+    ) -> List[Union[bytes, memoryview]]:
+        """Read data from several ``filepaths`` with 'rb' mode.
+
+        Backends that support it read the files concurrently.
+
+        Args:
+            filepaths (Sequence[str or Path]): Paths to read data.
+            max_workers (int, optional): Maximum number of threads used by
+                the backend. Default: None, chosen by the backend.
+
+        Returns:
+            list[bytes | memoryview]: The data of each path, in order.
+        """
+        return self.client.get_many(filepaths, max_workers)
+
     def put(self, obj: bytes, filepath: Union[str, Path]) -> None:
         """Write data to a given ``filepath`` with 'wb' mode.
 
@@ -540,6 +1134,8 @@ class FileClient:
                          list_dir: bool = True,
                          list_file: bool = True,
                          suffix: Optional[Union[str, Tuple[str]]] = None,
-                         recursive: bool = False) -> Iterator[str]:
+                         recursive: bool = False,
+                         **kwargs) -> Iterator[Union[str, os.DirEntry]]:
         yield from self.client.list_dir_or_file(dir_path, list_dir,
-                                                list_file, suffix, recursive)
+                                                list_file, suffix, recursive,
+                                                **kwargs)
@@ -1,8 +1,24 @@
+import importlib
+
 from .base import BaseFileHandler
-from .json_handler import JsonHandler
+
+# handlers are only imported when they are first accessed, so that importing
+# the package does not import the libraries they depend on
+_lazy_handlers = {
+    'JsonHandler': '.json_handler',
+    'JsonlHandler': '.jsonl_handler',
+}
+
+
+def __getattr__(name):
+    if name in _lazy_handlers:
+        module = importlib.import_module(_lazy_handlers[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 __all__ = [
     'BaseFileHandler',
-    'JsonHandler'
+    'JsonHandler',
+    'JsonlHandler'
 ]
\ No newline at end of file
@@ -1,4 +1,6 @@
+import locale
 from abc import ABCMeta, abstractmethod
+from io import StringIO
 
 # 继承ABCMeta元类，使其无法直接实例化
 class BaseFileHandler(metaclass=ABCMeta):
@@ -6,8 +8,10 @@ class BaseFileHandler(metaclass=ABCMeta):
     json 处理 string类型对象；
     pickle 处理 bytes类型对象。
     用 str_like 来表明处理类型
+    single_read 表明 load_from_fileobj 一次读完整个文件
     """
     str_like = True
+    single_read = False
 
     @abstractmethod
     def load_from_fileobj(self, file, **kwargs):
@@ -23,6 +27,18 @@ class BaseFileHandler(metaclass=ABCMeta):
 
     # 以下两个是对外接口
     def load_from_path(self, filepath: str, mode: str = 'r', **kwargs):
+        if self.single_read and mode in ('r', 'rb'):
+            # the whole file is read at once, so the buffered and text
+            # layers of ``open`` are skipped
+            with open(filepath, 'rb', buffering=0) as f:
+                if mode == 'rb':
+                    return self.load_from_fileobj(f, **kwargs)
+                content = f.readall()
+            # decode like ``open`` in text mode, including the translation
+            # of newlines
+            text = content.decode(locale.getpreferredencoding(False))
+            with StringIO(text, newline=None) as f:
+                return self.load_from_fileobj(f, **kwargs)
         with open(filepath, mode) as f:
             return self.load_from_fileobj(f, **kwargs)
 
@@ -1,23 +1,45 @@
 import json
-import numpy as np
+import sys
 
 from .base import BaseFileHandler
 
+try:
+    # orjson parses json several times faster than the standard library
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def set_default(obj):
     if isinstance(obj, (set, range)):
         return list(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, np.generic):
-        return obj.item()
+    # numpy objects can only exist if numpy has been imported, so there is
+    # no need to import it here
+    np = sys.modules.get('numpy')
+    if np is not None:
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        elif isinstance(obj, np.generic):
+            return obj.item()
     raise TypeError(f'{type(obj)} is unsupported for json dump.')
 
 
+def _loads(content):
+    if orjson is None:
+        return json.loads(content)
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # orjson rejects some inputs accepted by json, such as NaN or
+        # integers larger than 64 bits
+        return json.loads(content)
+
+
 class JsonHandler(BaseFileHandler):
+    single_read = True
 
     def load_from_fileobj(self, file, **kwargs):
-        return json.load(file)
+        return _loads(file.read())
 
     def dump_to_fileobj(self, obj, file, **kwargs):
         kwargs.setdefault('default', set_default)
@@ -0,0 +1,26 @@
+import json
+
+from .base import BaseFileHandler
+from .json_handler import _loads, set_default
+
+
+class JsonlHandler(BaseFileHandler):
+    """JSON Lines handler, one json value per line.
+
+    Records are parsed and serialized one line at a time. ``obj`` of
+    ``dump_to_fileobj`` can be any iterable, e.g. a generator, and is never
+    materialized as a whole.
+    """
+
+    def load_from_fileobj(self, file, **kwargs):
+        return [_loads(line) for line in file if not line.isspace()]
+
+    def dump_to_fileobj(self, obj, file, **kwargs):
+        kwargs.setdefault('default', set_default)
+        for record in obj:
+            file.write(json.dumps(record, **kwargs))
+            file.write('\n')
+
+    def dump_to_str(self, obj, **kwargs):
+        kwargs.setdefault('default', set_default)
+        return ''.join(json.dumps(record, **kwargs) + '\n' for record in obj)
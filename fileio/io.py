@@ -1,53 +1,243 @@
+import hashlib
+import os
+import os.path as osp
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from io import BytesIO, StringIO
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, TextIO, Union
 
-from .utils import is_list_of
-from .file_client import FileClient
-from .handlers import BaseFileHandler, JsonHandler
+from .utils import has_method, is_list_of, mkdir_or_exist
+from .file_client import FileClient, HardDiskBackend
+from .handlers import BaseFileHandler
 
 FileLikeObject = Union[TextIO, StringIO, BytesIO]
 
-file_handlers = {
-    'json': JsonHandler()
-}
+# parsed contents of local files loaded with ``cache=True``, keyed by
+# (absolute path, format, mtime, size) and evicted in LRU order
+_load_cache: OrderedDict = OrderedDict()
+_load_cache_lock = threading.Lock()
+_LOAD_CACHE_SIZE = 128
+# if the ``LOAD_CACHE_DIR`` environment variable is set, parsed contents
+# are also pickled to that directory so that other processes can reuse
+# them. The directory is trimmed to this size in LRU order once per process
+_LOAD_CACHE_DIR_SIZE = 1 << 30
+_trimmed_cache_dirs: set = set()
+_MISSING = object()
+
+
+def _ext(path: str) -> str:
+    """Return the lowercased extension of ``path`` without the dot."""
+    i = path.rfind('.')
+    return path[i + 1:].lower() if i >= 0 else ''
+
+
+# handlers added with ``register_handler``, they take precedence over the
+# built-in ones
+_registered_handlers: Dict[str, BaseFileHandler] = {}
+
+
+@lru_cache(maxsize=None)
+def _get_handler(file_format: Optional[str]) -> BaseFileHandler:
+    """Return the handler of ``file_format``.
+
+    Handlers are imported and created on first use, so formats that are
+    never loaded or dumped cost nothing.
+    """
+    if file_format in _registered_handlers:
+        return _registered_handlers[file_format]
+    if file_format == 'json':
+        from .handlers import JsonHandler
+        return JsonHandler()
+    if file_format == 'jsonl':
+        from .handlers import JsonlHandler
+        return JsonlHandler()
+    raise TypeError(f'Unsupported format: {file_format}')
+
+
+def _register_handler(handler: BaseFileHandler,
+                      file_formats: Union[str, List[str]]) -> None:
+    """Register a handler for some file extensions.
+
+    Args:
+        handler (:obj:`BaseFileHandler`): Handler to be registered.
+        file_formats (str or list[str]): File formats to be handled by this
+            handler.
+    """
+    if not isinstance(handler, BaseFileHandler):
+        raise TypeError(
+            f'handler must be a child of BaseFileHandler, not {type(handler)}')
+    if isinstance(file_formats, str):
+        file_formats = [file_formats]
+    if not is_list_of(file_formats, str):
+        raise TypeError('file_formats must be a str or a list of str')
+    for file_format in file_formats:
+        _registered_handlers[file_format] = handler
+    # handlers that were looked up before are cached
+    _get_handler.cache_clear()
+
+
+def register_handler(file_formats: Union[str, List[str]], **kwargs):
+    """Register the decorated handler class for ``file_formats``.
+
+    Examples:
+        >>> @register_handler('txt')
+        ... class TxtHandler(BaseFileHandler):
+        ...     ...
+    """
+
+    def wrap(cls):
+        _register_handler(cls(**kwargs), file_formats)
+        return cls
+
+    return wrap
+
+
+def _load_from_client(file_client: FileClient, file: str,
+                      handler: BaseFileHandler, **kwargs):
+    f: FileLikeObject
+    if handler.str_like:
+        with StringIO(file_client.get_text(file)) as f:
+            return handler.load_from_fileobj(f, **kwargs)
+    with BytesIO(file_client.get(file)) as f:
+        return handler.load_from_fileobj(f, **kwargs)
+
+
+def _disk_cache_path(cache_dir: str, key: tuple) -> str:
+    if cache_dir not in _trimmed_cache_dirs:
+        _trimmed_cache_dirs.add(cache_dir)
+        _trim_disk_cache(cache_dir)
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()
+    return osp.join(cache_dir, digest + '.pkl')
+
+
+def _disk_cache_get(cache_path: str):
+    try:
+        with open(cache_path, 'rb') as f:
+            obj = pickle.load(f)
+    except Exception:
+        # a missing, truncated or incompatible entry is treated as a miss
+        return _MISSING
+    try:
+        # mark the entry as recently used for ``_trim_disk_cache``, which
+        # is not possible in a read-only or shared directory
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return obj
+
+
+def _disk_cache_put(cache_dir: str, cache_path: str, obj: Any) -> None:
+    # write to a temporary file first so that other processes never read
+    # a partially written entry
+    try:
+        mkdir_or_exist(cache_dir)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # caching is best effort, e.g. the object can not be pickled
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _trim_disk_cache(cache_dir: str) -> None:
+    """Remove the least recently used entries beyond the size limit."""
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.pkl'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= _LOAD_CACHE_DIR_SIZE:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total_size -= size
+
+
+def _load_cached(file_client: FileClient, file: str, file_format: str,
+                 handler: BaseFileHandler):
+    st = os.stat(file)
+    # the absolute path is used, relative paths differ between working
+    # directories and processes
+    key = (osp.abspath(file), file_format, st.st_mtime_ns, st.st_size)
+    with _load_cache_lock:
+        if key in _load_cache:
+            _load_cache.move_to_end(key)
+            return _load_cache[key]
+    cache_dir = os.environ.get('LOAD_CACHE_DIR')
+    if cache_dir:
+        cache_path = _disk_cache_path(cache_dir, key)
+        obj = _disk_cache_get(cache_path)
+        if obj is _MISSING:
+            obj = _load_from_client(file_client, file, handler)
+            _disk_cache_put(cache_dir, cache_path, obj)
+    else:
+        obj = _load_from_client(file_client, file, handler)
+    with _load_cache_lock:
+        _load_cache[key] = obj
+        while len(_load_cache) > _LOAD_CACHE_SIZE:
+            _load_cache.popitem(last=False)
+    return obj
 
 
 def load(file: Union[str, Path, FileLikeObject],
          file_format: Optional[str] = None,
          file_client_args: Optional[Dict] = None,
+         cache: bool = False,
          **kwargs):
-    """Load data from json/.. files.
+    """Load data from json/jsonl/.. files.
 
     Args:
         file (str or :obj:`Path` or file-like object): Filename or a file-like
             object.
         file_format (str, optional): If not specified, the file format will be
             inferred from the file extension, otherwise use the specified one.
-            Currently supported formats include "json"...
+            Currently supported formats include "json", "jsonl" and the
+            formats added with :func:`register_handler`.
         file_client_args (dict, optional): Arguments to instantiate a
             FileClient.
+        cache (bool): If True, the parsed content of a local file is kept
+            and returned again as long as the modification time and size
+            of the file do not change. The same object is returned to
+            every caller, so it must not be modified. If the
+            ``LOAD_CACHE_DIR`` environment variable is set, the content is
+            also pickled to that directory and reused by later processes,
+            only point it to a directory that is trusted. Default: False.
 
     Returns:
         The content from the file.
     """
-    if isinstance(file, Path):
-        file = str(file)
+    if isinstance(file, os.PathLike):
+        # ``os.fspath`` accepts Path and any other path-like object
+        file = os.fspath(file)
     if file_format is None and isinstance(file, str):
-        file_format = file.split('.')[-1]
-    if file_format not in file_handlers:
-        raise TypeError(f'Unsupported format: {file_format}')
-
-    handler = file_handlers[file_format]
-    f: FileLikeObject
+        file_format = _ext(file)
+    handler = _get_handler(file_format)
     if isinstance(file, str):
         file_client = FileClient.infer_client(file_client_args, file)
-        if handler.str_like:
-            with StringIO(file_client.get_text(file)) as f:
-                obj = handler.load_from_fileobj(f, **kwargs)
+        if (cache and not kwargs
+                and isinstance(file_client.client, HardDiskBackend)):
+            obj = _load_cached(file_client, file, file_format, handler)
         else:
-            with BytesIO(file_client.get(file)) as f:
-                obj = handler.load_from_fileobj(f, **kwargs)
+            obj = _load_from_client(file_client, file, handler, **kwargs)
     elif hasattr(file, 'read'):
         obj = handler.load_from_fileobj(file, **kwargs)
     else:
@@ -77,30 +267,38 @@ def dump(obj: Any,
     Returns:
         bool: True for success, False otherwise.
     """
-    if isinstance(file, Path):
-        file = str(file)
+    if isinstance(file, os.PathLike):
+        file = os.fspath(file)
     if file_format is None:
         if isinstance(file, str):
-            file_format = file.split('.')[-1]
+            file_format = _ext(file)
         elif file is None:
             raise ValueError(
                 'file_format must be specified since file is None')
-    if file_format not in file_handlers:
-        raise TypeError(f'Unsupported format: {file_format}')
+    handler = _get_handler(file_format)
     f: FileLikeObject
-    handler = file_handlers[file_format]
     if file is None:
         return handler.dump_to_str(obj, **kwargs)
     elif isinstance(file, str):
         file_client = FileClient.infer_client(file_client_args, file)
+        # backends that can hand out a writable file object (e.g. the disk
+        # backend) are written directly, without an intermediate buffer
         if handler.str_like:
-            with StringIO() as f:
-                handler.dump_to_fileobj(obj, f, **kwargs)
-                file_client.put_text(f.getvalue(), file)
+            if has_method(file_client.client, 'put_text_stream'):
+                with file_client.client.put_text_stream(file) as f:
+                    handler.dump_to_fileobj(obj, f, **kwargs)
+            else:
+                with StringIO() as f:
+                    handler.dump_to_fileobj(obj, f, **kwargs)
+                    file_client.put_text(f.getvalue(), file)
         else:
-            with BytesIO() as f:
-                handler.dump_to_fileobj(obj, f, **kwargs)
-                file_client.put(f.getvalue(), file)
+            if has_method(file_client.client, 'put_stream'):
+                with file_client.client.put_stream(file) as f:
+                    handler.dump_to_fileobj(obj, f, **kwargs)
+            else:
+                with BytesIO() as f:
+                    handler.dump_to_fileobj(obj, f, **kwargs)
+                    file_client.put(f.getvalue(), file)
     elif hasattr(file, 'write'):
         handler.dump_to_fileobj(obj, file, **kwargs)
     else:
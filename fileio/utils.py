@@ -17,10 +17,12 @@ def is_seq_of(seq, expected_type, seq_type=None):
         exp_seq_type = seq_type
     if not isinstance(seq, exp_seq_type):
         return False
-    for item in seq:
-        if not isinstance(item, expected_type):
-            return False
-    return True
+    if isinstance(expected_type, type):
+        # an exact type match is checked first, it is cheaper than
+        # ``isinstance`` which walks the MRO of the item's type
+        return all(type(item) is expected_type
+                   or isinstance(item, expected_type) for item in seq)
+    return all(isinstance(item, expected_type) for item in seq)
 
 def is_list_of(seq, expected_type):
     return is_seq_of(seq, expected_type, seq_type=list)
@@ -33,5 +35,6 @@ def mkdir_or_exist(dir_name, mode=0o777):
     """0o777 = 511 permission"""
     if dir_name == '':
         return
-    dir_name = osp.expanduser(dir_name)
+    if os.fspath(dir_name).startswith('~'):
+        dir_name = osp.expanduser(dir_name)
     os.makedirs(dir_name, mode=mode, exist_ok=True)
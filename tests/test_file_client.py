@@ -0,0 +1,297 @@
+import io
+import itertools
+import locale
+import os
+import os.path as osp
+import subprocess
+import sys
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+
+import pytest
+
+from fileio import FileClient
+from fileio.file_client import HTTPBackend
+
+
+def test_lmdb_backend_renews_read_txn(tmp_path):
+    lmdb = pytest.importorskip('lmdb')
+    db_path = tmp_path / 'test.lmdb'
+    num_keys = 2000
+    with lmdb.open(str(db_path), map_size=1 << 24) as env:
+        with env.begin(write=True) as txn:
+            for i in range(num_keys):
+                txn.put(str(i).encode(), str(i).encode())
+
+    file_client = FileClient(backend='lmdb', db_path=db_path)
+    assert file_client.client.txn_renew_interval < num_keys
+    for i in range(num_keys):
+        assert file_client.get(str(i)) == str(i).encode()
+
+
+def test_lmdb_backend_sees_later_commits(tmp_path):
+    lmdb = pytest.importorskip('lmdb')
+    db_path = tmp_path / 'test.lmdb'
+    with lmdb.open(str(db_path), map_size=1 << 24) as env:
+        with env.begin(write=True) as txn:
+            txn.put(b'k', b'old')
+
+    file_client = FileClient(backend='lmdb', db_path=db_path)
+    assert file_client.get('k') == b'old'
+    # an environment must not be opened twice in one process
+    subprocess.run([
+        sys.executable, '-c',
+        'import lmdb, sys\n'
+        'with lmdb.open(sys.argv[1], map_size=1 << 24) as env:\n'
+        '    with env.begin(write=True) as txn:\n'
+        '        txn.put(b"k", b"new")\n'
+        '        txn.put(b"k2", b"x")\n', str(db_path)
+    ], check=True)
+    time.sleep(file_client.client.txn_max_age)
+    assert file_client.get('k') == b'new'
+    assert file_client.get('k2') == b'x'
+
+
+def test_disk_backend_get_many(tmp_path):
+    filepaths = []
+    for i in range(100):
+        filepath = tmp_path / f'{i}.txt'
+        filepath.write_bytes(str(i).encode())
+        filepaths.append(filepath)
+
+    file_client = FileClient(backend='disk')
+    assert file_client.get_many(filepaths) == [
+        str(i).encode() for i in range(100)
+    ]
+    assert file_client.get_many(filepaths[:3], max_workers=1) == [
+        b'0', b'1', b'2'
+    ]
+    assert file_client.get_many([]) == []
+
+
+def test_lmdb_backend_get_many(tmp_path):
+    lmdb = pytest.importorskip('lmdb')
+    db_path = tmp_path / 'test.lmdb'
+    with lmdb.open(str(db_path), map_size=1 << 24) as env:
+        with env.begin(write=True) as txn:
+            for i in range(100):
+                txn.put(str(i).encode(), str(i).encode())
+
+    file_client = FileClient(backend='lmdb', db_path=db_path, buffers=True)
+    values = file_client.get_many([str(i) for i in range(100)] + ['missing'])
+    # values read by the worker threads are copied out of their transactions
+    assert values == [str(i).encode() for i in range(100)] + [None]
+    assert all(type(value) is bytes for value in values[:-1])
+
+
+def test_disk_backend_get_text(tmp_path):
+    filepath = tmp_path / 'test.txt'
+    content = 'héllo\n'.encode('utf-8')
+    filepath.write_bytes(content)
+
+    file_client = FileClient(backend='disk')
+    assert file_client.get_text(filepath) == 'héllo\n'
+    assert file_client.get_text(filepath, 'latin-1') == \
+        content.decode('latin-1')
+    # None means the locale encoding, as for ``open``
+    assert file_client.client.get_text(filepath, encoding=None) == \
+        content.decode(locale.getpreferredencoding(False))
+
+
+def test_disk_backend_list_dir_or_file_recursive(tmp_path):
+    (tmp_path / 'sub' / 'deeper').mkdir(parents=True)
+    (tmp_path / 'a.txt').write_text('')
+    (tmp_path / 'sub' / 'b.txt').write_text('')
+    (tmp_path / 'sub' / 'deeper' / 'c.json').write_text('')
+
+    file_client = FileClient(backend='disk')
+    assert set(file_client.list_dir_or_file(tmp_path)) == {'a.txt', 'sub'}
+    assert set(file_client.list_dir_or_file(tmp_path, recursive=True)) == {
+        'a.txt', 'sub', osp.join('sub', 'b.txt'),
+        osp.join('sub', 'deeper'),
+        osp.join('sub', 'deeper', 'c.json')
+    }
+    assert set(
+        file_client.list_dir_or_file(
+            tmp_path, list_dir=False, suffix='.txt', recursive=True)) == {
+                'a.txt', osp.join('sub', 'b.txt')
+            }
+    assert set(
+        file_client.list_dir_or_file(
+            tmp_path, list_file=False, recursive=True)) == {
+                'sub', osp.join('sub', 'deeper')
+            }
+
+
+def test_disk_backend_list_dir_or_file_return_entries(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.txt').write_text('')
+    (tmp_path / 'sub' / 'b.txt').write_text('')
+
+    file_client = FileClient(backend='disk')
+    entries = list(
+        file_client.list_dir_or_file(
+            tmp_path, recursive=True, return_entries=True))
+    assert all(isinstance(entry, os.DirEntry) for entry in entries)
+    assert {osp.relpath(entry.path, tmp_path) for entry in entries} == set(
+        file_client.list_dir_or_file(tmp_path, recursive=True))
+    assert {entry.name for entry in entries} == {'a.txt', 'sub', 'b.txt'}
+
+
+def test_disk_backend_list_dir_or_file_workers(tmp_path, monkeypatch):
+    for i in range(5):
+        for j in range(5):
+            (tmp_path / str(i) / str(j)).mkdir(parents=True)
+            (tmp_path / str(i) / str(j) / 'a.txt').write_text('')
+
+    file_client = FileClient(backend='disk')
+    expected = sorted(file_client.list_dir_or_file(tmp_path, recursive=True))
+    assert len(expected) == 5 + 25 + 25
+    assert sorted(
+        file_client.list_dir_or_file(tmp_path, recursive=True,
+                                     workers=4)) == expected
+
+    # errors raised while scanning in a worker thread reach the caller
+    with pytest.raises(FileNotFoundError):
+        list(
+            file_client.list_dir_or_file(
+                tmp_path / 'missing', recursive=True, workers=4))
+
+    scandir = os.scandir
+
+    def broken_scandir(path):
+        if osp.basename(path) == '3':
+            raise PermissionError(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', broken_scandir)
+    with pytest.raises(PermissionError):
+        list(file_client.list_dir_or_file(tmp_path, recursive=True,
+                                          workers=4))
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_disk_backend_list_dir_or_file_chunk_size(tmp_path, workers):
+    for i in range(3):
+        (tmp_path / str(i)).mkdir()
+        for j in range(10):
+            (tmp_path / str(i) / f'{j}.txt').write_text('')
+
+    file_client = FileClient(backend='disk')
+    expected = sorted(
+        file_client.list_dir_or_file(tmp_path, list_dir=False,
+                                     recursive=True))
+    chunks = list(
+        file_client.list_dir_or_file(
+            tmp_path, list_dir=False, recursive=True, workers=workers,
+            chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4] * 7 + [2]
+    assert sorted(itertools.chain.from_iterable(chunks)) == expected
+
+
+def test_disk_backend_list_dir_or_file_is_lazy(tmp_path, monkeypatch):
+    for i in range(10):
+        (tmp_path / f'{i}.txt').write_text('')
+
+    scandir = os.scandir
+
+    @contextmanager
+    def broken_scandir(path):
+        # fail after the first entry, like a directory that is too large
+        # to be listed at once
+        with scandir(path) as it:
+            yield itertools.chain(itertools.islice(it, 1), _raise())
+
+    def _raise():
+        raise RuntimeError
+        yield
+
+    monkeypatch.setattr(os, 'scandir', broken_scandir)
+    file_client = FileClient(backend='disk')
+    results = file_client.list_dir_or_file(tmp_path)
+    # the first result is yielded before the directory is read to the end
+    assert next(results).endswith('.txt')
+    with pytest.raises(RuntimeError):
+        next(results)
+    with pytest.raises(RuntimeError):
+        list(file_client.list_dir_or_file(tmp_path, chunk_size=4))
+
+
+def test_http_download_failure_keeps_existing_file(tmp_path, monkeypatch):
+    dst = tmp_path / 'file.png'
+    dst.write_bytes(b'old')
+
+    class BrokenResponse(io.RawIOBase):
+
+        def readinto(self, b):
+            raise ConnectionResetError
+
+    @contextmanager
+    def _open(filepath):
+        yield BrokenResponse()
+
+    client = FileClient(prefix='https').client
+    monkeypatch.setattr(client, '_open', _open)
+    with pytest.raises(ConnectionResetError):
+        client.download('https://path/of/your/file', dst)
+    assert dst.read_bytes() == b'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['file.png']
+
+
+def test_list_dir_or_file_empty_suffix_matches_all(tmp_path):
+    for name in ('a.txt', 'b.json', 'README'):
+        (tmp_path / name).write_text('')
+
+    file_client = FileClient(backend='disk')
+    files = set(
+        file_client.list_dir_or_file(
+            tmp_path, list_dir=False, suffix=('.a', '.b', '.c', '.d', '')))
+    assert files == {'a.txt', 'b.json', 'README'}
+
+
+def test_http_prefetch_cancels_dropped_downloads(monkeypatch):
+    client = HTTPBackend()
+    started = []
+    release = threading.Event()
+
+    def _fetch(filepath):
+        started.append(filepath)
+        release.wait()
+        return filepath.encode()
+
+    monkeypatch.setattr(client, '_fetch', _fetch)
+    urls = [f'https://path/of/your/file{i}' for i in range(500)]
+    for url in urls:
+        client.prefetch(url)
+    release.set()
+    # the kept downloads complete, the dropped ones that were still queued
+    # never start
+    assert client.get(urls[-1]) == urls[-1].encode()
+    client._prefetch_executor.shutdown(wait=True)
+    assert len(started) <= 4 + client.max_prefetch
+    assert len(client._prefetched) == client.max_prefetch - 1
+
+
+def test_lmdb_backend_readahead_warning(tmp_path, monkeypatch):
+    lmdb = pytest.importorskip('lmdb')
+    db_paths = [tmp_path / 'a.lmdb', tmp_path / 'b.lmdb']
+    for db_path in db_paths:
+        with lmdb.open(str(db_path), map_size=1 << 40) as env:
+            with env.begin(write=True) as txn:
+                txn.put(b'k', b'v')
+
+    # a large map size alone does not warn
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        file_client = FileClient(backend='lmdb', db_path=db_paths[0],
+                                 readonly=False, readahead=True,
+                                 map_size=1 << 40)
+        assert file_client.get('k') == b'v'
+
+    monkeypatch.setattr('fileio.file_client._total_memory', lambda: 1024)
+    file_client = FileClient(backend='lmdb', db_path=db_paths[1],
+                             readahead=True)
+    with pytest.warns(UserWarning, match='larger than RAM'):
+        assert file_client.get('k') == b'v'
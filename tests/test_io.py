@@ -0,0 +1,238 @@
+import math
+import os
+import subprocess
+import sys
+
+import pytest
+
+from fileio import dump, load, register_handler
+from fileio.handlers import BaseFileHandler
+
+
+def test_load_json_falls_back_for_nan_and_big_ints(tmp_path):
+    filepath = tmp_path / 'test.json'
+    big_int = 1 << 70
+    filepath.write_text(f'{{"a": NaN, "b": {big_int}, "c": [1, "x"]}}')
+    obj = load(filepath)
+    assert math.isnan(obj['a'])
+    assert obj['b'] == big_int
+    assert obj['c'] == [1, 'x']
+
+
+def test_jsonl_round_trip(tmp_path):
+    records = [{'a': 1}, [1, 2], 'x', None, {'b': {3}}]
+    expected = [{'a': 1}, [1, 2], 'x', None, {'b': [3]}]
+    filepath = tmp_path / 'test.jsonl'
+    # any iterable of records can be dumped, including a generator
+    dump((record for record in records), filepath)
+    assert filepath.read_text().count('\n') == len(records)
+    assert load(filepath) == expected
+
+    content = dump(records, file_format='jsonl')
+    assert content.splitlines()[0] == '{"a": 1}'
+    filepath.write_text(content + '\n')
+    # blank lines are skipped
+    assert load(filepath) == expected
+
+
+def test_load_cache_hit_and_invalidation(tmp_path):
+    filepath = str(tmp_path / 'test.json')
+    dump({'a': 1}, filepath)
+    obj = load(filepath, cache=True)
+    assert obj == {'a': 1}
+    # the same parsed object is returned while the file is unchanged
+    assert load(filepath, cache=True) is obj
+    assert load(filepath) is not obj
+
+    dump({'a': 12}, filepath)
+    assert load(filepath, cache=True) == {'a': 12}
+
+
+def test_dump_failure_keeps_existing_file(tmp_path):
+    filepath = tmp_path / 'test.json'
+    dump({'a': 1}, filepath)
+    with pytest.raises(TypeError):
+        dump({'a': object()}, filepath)
+    assert load(filepath) == {'a': 1}
+    assert os.listdir(tmp_path) == ['test.json']
+
+
+def test_dump_jsonl_generator_failure_keeps_existing_file(tmp_path):
+    filepath = tmp_path / 'test.jsonl'
+    dump([{'a': 1}], filepath)
+
+    def records():
+        yield {'a': 2}
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        dump(records(), filepath)
+    assert load(filepath) == [{'a': 1}]
+    assert os.listdir(tmp_path) == ['test.jsonl']
+
+
+def test_load_dump_invalid_file_type():
+    with pytest.raises(TypeError, match='must be a filepath str'):
+        load(123, file_format='json')
+    with pytest.raises(TypeError, match='must be a filename str'):
+        dump({'a': 1}, 123, file_format='json')
+
+
+def test_load_cache_keys_on_absolute_path(tmp_path, monkeypatch):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    (tmp_path / 'a' / 'test.json').write_text('{"a": 1}')
+    (tmp_path / 'b' / 'test.json').write_text('{"b": 2}')
+    # same size and mtime, only the directory tells the files apart
+    for d in ('a', 'b'):
+        os.utime(tmp_path / d / 'test.json', ns=(0, 0))
+    monkeypatch.chdir(tmp_path / 'a')
+    assert load('test.json', cache=True) == {'a': 1}
+    monkeypatch.chdir(tmp_path / 'b')
+    assert load('test.json', cache=True) == {'b': 2}
+
+
+def test_dump_keeps_links_and_permissions(tmp_path):
+    target = tmp_path / 'target.json'
+    dump({'a': 1}, target)
+    target.chmod(0o640)
+    link = tmp_path / 'link.json'
+    link.symlink_to(target)
+    hard_link = tmp_path / 'hard_link.json'
+    os.link(target, hard_link)
+
+    dump({'a': 2}, link)
+    assert link.is_symlink()
+    assert load(target) == {'a': 2}
+    # hard links are written in place, both names see the new content
+    assert load(hard_link) == {'a': 2}
+    assert target.stat().st_mode & 0o777 == 0o640
+
+    hard_link.unlink()
+    dump({'a': 3}, target)
+    assert load(link) == {'a': 3}
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert sorted(os.listdir(tmp_path)) == ['link.json', 'target.json']
+
+
+def test_dump_long_file_name(tmp_path):
+    filepath = tmp_path / ('a' * 250 + '.json')
+    dump({'a': 1}, filepath)
+    dump({'a': 2}, filepath)
+    assert load(filepath) == {'a': 2}
+
+
+@pytest.mark.skipif(
+    not hasattr(os, 'geteuid') or os.geteuid() != 0,
+    reason='changing the owner of a file requires root')
+def test_dump_keeps_owner(tmp_path):
+    filepath = tmp_path / 'test.json'
+    dump({'a': 1}, filepath)
+    os.chown(filepath, 65534, 65534)
+    dump({'a': 2}, filepath)
+    assert load(filepath) == {'a': 2}
+    st = filepath.stat()
+    assert (st.st_uid, st.st_gid) == (65534, 65534)
+
+
+def test_load_disk_cache(tmp_path, monkeypatch):
+    import fileio.io
+
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setenv('LOAD_CACHE_DIR', str(cache_dir))
+    filepath = str(tmp_path / 'test.json')
+    dump({'a': 1}, filepath)
+
+    def load_from_disk_cache():
+        # drop the in-memory cache, as a new process would start without it
+        fileio.io._load_cache.clear()
+        return load(filepath, cache=True)
+
+    # miss, the parsed content is pickled
+    assert load_from_disk_cache() == {'a': 1}
+    cache_files = os.listdir(cache_dir)
+    assert len(cache_files) == 1 and cache_files[0].endswith('.pkl')
+
+    def fail(*args, **kwargs):
+        raise AssertionError('the file should not be parsed')
+
+    # hit, even if the entry can not be marked as recently used
+    with monkeypatch.context() as m:
+        m.setattr(fileio.io, '_load_from_client', fail)
+        assert load_from_disk_cache() == {'a': 1}
+
+        def utime(*args, **kwargs):
+            raise PermissionError
+
+        m.setattr(os, 'utime', utime)
+        assert load_from_disk_cache() == {'a': 1}
+
+    # a corrupt entry is parsed again and replaced
+    (cache_dir / cache_files[0]).write_bytes(b'not a pickle')
+    assert load_from_disk_cache() == {'a': 1}
+    with monkeypatch.context() as m:
+        m.setattr(fileio.io, '_load_from_client', fail)
+        assert load_from_disk_cache() == {'a': 1}
+
+    # a modified file gets a new entry
+    dump({'a': 12}, filepath)
+    assert load_from_disk_cache() == {'a': 12}
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_load_disk_cache_trim(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    for i in range(4):
+        entry = cache_dir / f'{i}.pkl'
+        entry.write_bytes(b'x' * 100)
+        os.utime(entry, (i, i))
+    monkeypatch.setenv('LOAD_CACHE_DIR', str(cache_dir))
+    monkeypatch.setattr('fileio.io._LOAD_CACHE_DIR_SIZE', 250)
+
+    filepath = tmp_path / 'test.json'
+    dump({'a': 1}, filepath)
+    assert load(filepath, cache=True) == {'a': 1}
+    # the least recently used entries are removed once per directory
+    # before the new entry is added
+    remaining = set(os.listdir(cache_dir))
+    assert len(remaining) == 3
+    assert {'2.pkl', '3.pkl'} < remaining
+
+
+def test_handlers_are_imported_lazily():
+    code = ('import sys\n'
+            'import fileio\n'
+            'assert "fileio.handlers.json_handler" not in sys.modules\n'
+            'from fileio import JsonHandler\n'
+            'assert "fileio.handlers.json_handler" in sys.modules\n')
+    # run from the repository root so that ``fileio`` is importable
+    subprocess.run([sys.executable, '-c', code],
+                   cwd=os.path.dirname(os.path.dirname(__file__)),
+                   check=True)
+
+
+def test_register_handler(tmp_path):
+
+    @register_handler(['txt', 'log'])
+    class TxtHandler(BaseFileHandler):
+
+        def load_from_fileobj(self, file, **kwargs):
+            return file.read().splitlines()
+
+        def dump_to_fileobj(self, obj, file, **kwargs):
+            file.write(self.dump_to_str(obj))
+
+        def dump_to_str(self, obj, **kwargs):
+            return ''.join(f'{line}\n' for line in obj)
+
+    filepath = tmp_path / 'test.txt'
+    dump(['a', 'b'], filepath)
+    assert filepath.read_text() == 'a\nb\n'
+    assert load(filepath) == ['a', 'b']
+    assert dump(['c'], file_format='log') == 'c\n'
+
+    with pytest.raises(TypeError):
+        register_handler('txt')(object)
+    with pytest.raises(TypeError):
+        load(tmp_path / 'test.unknown')